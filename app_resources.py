@@ -0,0 +1,275 @@
+"""
+Process-wide shared resources and memory accounting for the Streamlit app.
+
+Streamlit re-runs calculator.py for every session on every widget change, but
+imported modules and st.cache_resource objects live once per server process.
+Everything that is the same for all users is therefore kept here and built
+once instead of per session.
+"""
+import os
+import sys
+import threading
+import time
+import streamlit as st
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# ============================================================================
+# CUSTOM CSS STYLING
+# ============================================================================
+# Built once per process when the module is first imported
+APP_CSS = """
+<style>
+    /* ===== SIDEBAR COMPACT ===== */
+    /* Remove gaps between sidebar elements */
+    [data-testid="stSidebar"] [data-testid="stVerticalBlock"] > [style*="flex-direction: column;"] > [data-testid="stVerticalBlock"] {
+        gap: 0rem !important;
+    }
+    /* Make sliders more compact */
+    [data-testid="stSidebar"] .stSlider {
+        padding-top: 0rem !important;
+        padding-bottom: 0.2rem !important;
+        margin-bottom: 0rem !important;
+    }
+    /* Remove extra spacing from sidebar elements */
+    [data-testid="stSidebar"] .element-container {
+        margin-bottom: 0rem !important;
+        margin-top: 0rem !important;
+        padding-bottom: 0rem !important;
+        padding-top: 0rem !important;
+    }
+    /* Make sidebar headers smaller */
+    [data-testid="stSidebar"] h2 {
+        margin-top: 0.3rem !important;
+        margin-bottom: 0.2rem !important;
+        padding-top: 0rem !important;
+        padding-bottom: 0rem !important;
+        font-size: 1rem !important;
+    }
+    /* Compact divider lines in sidebar */
+    [data-testid="stSidebar"] hr {
+        margin-top: 0.2rem !important;
+        margin-bottom: 0.2rem !important;
+    }
+    /* Compact dropdown boxes */
+    [data-testid="stSidebar"] .stSelectbox {
+        margin-bottom: 0rem !important;
+        padding-bottom: 0rem !important;
+    }
+    /* Reduce top padding of sidebar */
+    [data-testid="stSidebar"] > div:first-child {
+        padding-top: 1rem !important;
+    }
+    /* Compact slider labels */
+    [data-testid="stSidebar"] .stSlider label {
+        margin-bottom: 0.1rem !important;
+    }
+    /* Compact all form element labels */
+    [data-testid="stSidebar"] .stSelectbox label,
+    [data-testid="stSidebar"] .stNumberInput label {
+        margin-bottom: 0.1rem !important;
+    }
+
+    /* ===== MAIN CONTENT EXTREMELY COMPACT ===== */
+    /* Remove spacing from main content elements */
+    .main .element-container {
+        margin-bottom: 0rem !important;
+        margin-top: 0rem !important;
+        padding-bottom: 0rem !important;
+        padding-top: 0rem !important;
+    }
+    /* Compact metric cards */
+    [data-testid="stMetric"] {
+        padding: 0.2rem 0.5rem !important;
+    }
+    [data-testid="stMetricLabel"] {
+        padding-bottom: 0rem !important;
+        margin-bottom: 0rem !important;
+    }
+    [data-testid="stMetricValue"] {
+        padding-top: 0rem !important;
+        margin-top: 0rem !important;
+    }
+    /* Compact main headers */
+    .main h1 {
+        margin-bottom: 0.2rem !important;
+        margin-top: 0rem !important;
+        padding-bottom: 0rem !important;
+        padding-top: 0rem !important;
+        line-height: 1.2 !important;
+    }
+    .main h2 {
+        margin-top: 0.2rem !important;
+        margin-bottom: 0.2rem !important;
+        padding: 0rem !important;
+        line-height: 1.2 !important;
+    }
+    .main h3 {
+        margin-top: 0.1rem !important;
+        margin-bottom: 0.1rem !important;
+        padding: 0rem !important;
+        line-height: 1.2 !important;
+    }
+    /* Compact divider lines */
+    .main hr {
+        margin-top: 0.3rem !important;
+        margin-bottom: 0.3rem !important;
+    }
+    /* Reduce gap between columns */
+    [data-testid="stHorizontalBlock"] {
+        gap: 0.3rem !important;
+    }
+    /* Compact tabs */
+    [data-testid="stTabs"] {
+        margin-top: 0.2rem !important;
+        margin-bottom: 0rem !important;
+    }
+    [data-testid="stTabContent"] {
+        padding-top: 0.3rem !important;
+        padding-bottom: 0rem !important;
+    }
+    /* Compact markdown text */
+    .main .stMarkdown {
+        margin-bottom: 0rem !important;
+        margin-top: 0rem !important;
+        padding-bottom: 0rem !important;
+        padding-top: 0rem !important;
+    }
+    .main .stMarkdown p {
+        margin-bottom: 0.2rem !important;
+        margin-top: 0rem !important;
+    }
+    /* Compact charts */
+    .main .stPlotlyChart {
+        margin-top: 0rem !important;
+        margin-bottom: 0rem !important;
+        padding-top: 0rem !important;
+        padding-bottom: 0rem !important;
+    }
+    /* Reduce main page top padding */
+    .main > div {
+        padding-top: 0.5rem !important;
+    }
+    /* Remove gaps in vertical layouts */
+    .main [data-testid="stVerticalBlock"] {
+        gap: 0rem !important;
+    }
+    /* Compact paragraphs */
+    .main p {
+        margin-bottom: 0.1rem !important;
+        margin-top: 0rem !important;
+    }
+    /* Compact lists */
+    .main ul, .main ol {
+        margin-top: 0rem !important;
+        margin-bottom: 0.2rem !important;
+        padding-top: 0rem !important;
+    }
+    .main li {
+        margin-bottom: 0.1rem !important;
+    }
+    /* Compact alert messages */
+    .main .stSuccess, .main .stWarning, .main .stError {
+        padding: 0.3rem 0.5rem !important;
+        margin-top: 0.2rem !important;
+        margin-bottom: 0.2rem !important;
+    }
+</style>
+"""
+
+
+# ============================================================================
+# MEMORY ACCOUNTING
+# ============================================================================
+# Fallback when the Streamlit runtime cannot tell which sessions are still
+# connected: sessions not seen for this long count as gone
+SESSION_IDLE_TIMEOUT_S = 5 * 60
+
+# RSS of the process at the start of the first script run, once the app's
+# modules are loaded; everything above this is attributed to sessions
+_BASELINE_RSS = None
+
+
+def process_rss_bytes():
+    """Current resident set size of this process, or None if unavailable."""
+    try:
+        # Linux: second field of /proc/self/statm is resident pages
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # Peak (not current) RSS; kB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+@st.cache_resource(show_spinner=False)
+def _session_registry():
+    """Process-wide {session_id: last_seen} table."""
+    return {'lock': threading.Lock(), 'sessions': {}}
+
+
+def _is_live(session_id, last_seen, now):
+    """True while the session's browser tab is still connected."""
+    if runtime.exists():
+        # Closed tabs are disconnected right away, so they stop counting
+        return runtime.get_instance().is_active_session(session_id)
+    return now - last_seen <= SESSION_IDLE_TIMEOUT_S
+
+
+def _prune(sessions, now):
+    """Drop sessions that are no longer connected; caller holds the lock."""
+    for session_id, last_seen in list(sessions.items()):
+        if not _is_live(session_id, last_seen, now):
+            del sessions[session_id]
+
+
+def track_session():
+    """Record that the current session is active; call once per script run.
+
+    Disconnected sessions are dropped on every call, so the registry never
+    holds more entries than there are live sessions plus the current one.
+    """
+    global _BASELINE_RSS
+    if _BASELINE_RSS is None:
+        _BASELINE_RSS = process_rss_bytes()
+
+    ctx = get_script_run_ctx()
+    if ctx is None:  # Not running inside a Streamlit server
+        return
+    registry = _session_registry()
+    now = time.monotonic()
+    with registry['lock']:
+        _prune(registry['sessions'], now)
+        registry['sessions'][ctx.session_id] = now
+
+
+def memory_summary():
+    """Process-level memory estimate: RSS, live sessions, RSS growth per session.
+
+    The per-session figure is (process RSS - baseline) / live sessions. It is
+    an average over everything the process holds, including allocator slack
+    and caches, not a measurement of any one session's objects; see
+    benchmarks/session_memory.py for a controlled measurement.
+    """
+    registry = _session_registry()
+    now = time.monotonic()
+    with registry['lock']:
+        _prune(registry['sessions'], now)
+        live = len(registry['sessions'])
+
+    rss = process_rss_bytes()
+    avg_per_session = None
+    if rss is not None and _BASELINE_RSS is not None and live:
+        avg_per_session = max(rss - _BASELINE_RSS, 0) / live
+
+    return {
+        'rss_bytes': rss,
+        'baseline_rss_bytes': _BASELINE_RSS,
+        'live_sessions': live,
+        'avg_rss_per_session_bytes': avg_per_session,
+    }
@@ -0,0 +1,195 @@
+"""
+Measure server memory per active Streamlit session.
+
+Starts `streamlit run <app>` and connects many websocket clients that behave
+like browser tabs. Each client runs the script once with the defaults and once
+with its own Final Biomass value, then stays connected. The script prints how
+much the server's resident memory grew per connected session.
+
+With --python-heap the app is instead run through a small wrapper that starts
+tracemalloc after the warm-up session and reports the Python heap still held
+once all sessions are connected. That number is slower to get but much less
+noisy than RSS, which moves in whole pages and includes allocator slack.
+
+Usage:
+    python benchmarks/session_memory.py --sessions 100
+    python benchmarks/session_memory.py --python-heap --sessions 30
+    python benchmarks/session_memory.py --app /path/to/other/calculator.py
+
+Linux only (reads /proc/<pid>/statm). Needs the `websockets` package, which
+is installed with streamlit's server dependencies.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+APP_DEFAULT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'calculator.py')
+SLIDER_LABEL = "Final Biomass (g/L)"
+
+# Runs the app unchanged unless the run's query string is ?tracemalloc=...
+HEAP_WRAPPER = """\
+import gc, runpy, sys, tracemalloc
+import streamlit as st
+
+_command = st.query_params.get("tracemalloc")
+if _command == "start":
+    gc.collect()
+    tracemalloc.start()
+    st.stop()
+if _command == "report":
+    gc.collect()
+    with open({result_file!r}, "w") as f:
+        f.write(str(tracemalloc.get_traced_memory()[0]))
+    st.stop()
+
+sys.path.insert(0, {app_dir!r})
+runpy.run_path({app!r}, run_name="__main__")
+"""
+
+
+def server_rss_bytes(pid):
+    with open(f'/proc/{pid}/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def start_server(app, port):
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', app,
+         '--server.headless', 'true', '--server.port', str(port),
+         '--server.enableXsrfProtection', 'false', '--server.fileWatcherType', 'none',
+         '--browser.gatherUsageStats', 'false'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(300):  # Up to 60 s
+        try:
+            urllib.request.urlopen(f'http://localhost:{port}/_stcore/health', timeout=1)
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("streamlit server did not start")
+
+
+async def run_script(ws, widget_states=None):
+    """Request a script run and read messages until it finishes.
+
+    Returns the id of the Final Biomass slider.
+    """
+    msg = BackMsg()
+    msg.rerun_script.query_string = ''
+    if widget_states:
+        msg.rerun_script.widget_states.widgets.extend(widget_states)
+    await ws.send(msg.SerializeToString())
+
+    slider_id = None
+    while True:
+        fwd = ForwardMsg()
+        fwd.ParseFromString(await ws.recv())
+        if fwd.HasField('delta') and fwd.delta.new_element.WhichOneof('type') == 'slider':
+            if fwd.delta.new_element.slider.label == SLIDER_LABEL:
+                slider_id = fwd.delta.new_element.slider.id
+        if fwd.WhichOneof('type') == 'script_finished':
+            return slider_id
+
+
+async def open_session(port, biomass=None):
+    """Connect like a browser tab, run the defaults, then optionally a new biomass."""
+    ws = await websockets.connect(f'ws://localhost:{port}/_stcore/stream',
+                                  subprotocols=['streamlit'], max_size=None)
+    slider_id = await run_script(ws)
+    if biomass is not None:
+        state = BackMsg().rerun_script.widget_states.widgets.add()
+        state.id = slider_id
+        state.double_array_value.data.append(biomass)
+        await run_script(ws, [state])
+    return ws
+
+
+async def tracemalloc_command(port, command):
+    """Send ?tracemalloc=<command> to the wrapped app from a throwaway session."""
+    ws = await websockets.connect(f'ws://localhost:{port}/_stcore/stream',
+                                  subprotocols=['streamlit'], max_size=None)
+    msg = BackMsg()
+    msg.rerun_script.query_string = f'tracemalloc={command}'
+    await ws.send(msg.SerializeToString())
+    while True:
+        fwd = ForwardMsg()
+        fwd.ParseFromString(await ws.recv())
+        if fwd.WhichOneof('type') == 'script_finished':
+            break
+    await ws.close()
+    await asyncio.sleep(0.5)  # Let the server drop the throwaway session
+
+
+async def measure(port, pid, sessions, python_heap=False):
+    # Warm-up: first script run imports everything and fills module caches
+    warmup = await open_session(port, biomass=60.0)
+    await asyncio.sleep(1)
+    if python_heap:
+        await tracemalloc_command(port, 'start')
+    rss_before = server_rss_bytes(pid)
+
+    clients = []
+    for i in range(sessions):
+        # Distinct inputs per session: 50.0, 50.5, ... g/L (wrapping at 95)
+        clients.append(await open_session(port, biomass=50.0 + (i % 90) * 0.5))
+    await asyncio.sleep(1)
+    rss_after = server_rss_bytes(pid)
+    if python_heap:
+        await tracemalloc_command(port, 'report')
+
+    for ws in clients + [warmup]:
+        await ws.close()
+    return rss_before, rss_after
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure server RSS per active Streamlit session.")
+    parser.add_argument('--app', default=APP_DEFAULT, help="Streamlit script to run (default: calculator.py)")
+    parser.add_argument('--sessions', type=int, default=100, help="Concurrent sessions (default: 100)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--python-heap', action='store_true',
+                        help="Report the Python heap per session instead of RSS (tracemalloc; slower)")
+    args = parser.parse_args()
+
+    app = os.path.abspath(args.app)
+    with tempfile.TemporaryDirectory() as tmp:
+        result_file = os.path.join(tmp, 'traced_bytes')
+        if args.python_heap:
+            script = os.path.join(tmp, 'heap_wrapper.py')
+            with open(script, 'w') as f:
+                f.write(HEAP_WRAPPER.format(app=app, app_dir=os.path.dirname(app), result_file=result_file))
+        else:
+            script = app
+
+        proc = start_server(script, args.port)
+        try:
+            rss_before, rss_after = asyncio.run(
+                measure(args.port, proc.pid, args.sessions, args.python_heap))
+        finally:
+            proc.terminate()
+            proc.wait()
+
+        print(f"{args.app}")
+        if args.python_heap:
+            # RSS is skipped here: it includes tracemalloc's own bookkeeping
+            with open(result_file) as f:
+                traced = int(f.read())
+            print(f"  Python heap per session:      {traced / args.sessions / 1e3:.1f} kB")
+        else:
+            print(f"  server RSS with 1 session:    {rss_before / 1e6:.1f} MB")
+            print(f"  server RSS with {args.sessions + 1} sessions: {rss_after / 1e6:.1f} MB")
+            print(f"  RSS per added session:        {(rss_after - rss_before) / args.sessions / 1e3:.0f} kB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+"""
+Bulk report export - one static HTML report per scenario plus an Excel summary.
+
+Usage:
+    python bulk_report.py scenarios.csv -o reports/ -j 8
+
+Each row of the CSV is one candidate plant configuration. Columns are the
+sidebar inputs (see scp_model.DEFAULT_INPUTS); missing columns fall back to
+the defaults. An optional 'scenario' column names the report file.
+"""
+import argparse
+import html
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from string import Template
+
+import pandas as pd
+from plotly.offline import get_plotlyjs
+
+from scp_model import (
+    DEFAULT_INPUTS, SELLING_PRICE, literature_benchmarks, calculate_scenario, kpi_cards, cost_table,
+    ghg_table, benchmark_table, competitive_position, cost_figure, ghg_figure, benchmark_figures,
+)
+
+# ============================================================================
+# STATIC REPORT TEMPLATE
+# ============================================================================
+# plotly.min.js is written once next to the reports and referenced by every
+# page, instead of embedding ~3 MB of JavaScript in each file
+PLOTLY_JS_FILE = 'plotly.min.js'
+
+REPORT_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>SCP Scale-Up Report - ${title}</title>
+<script src="${plotly_js}"></script>
+<style>
+    body { font-family: sans-serif; margin: 1.5rem; }
+    .kpis { display: flex; gap: 1rem; }
+    .kpi { flex: 1; border: 1px solid #ddd; border-radius: 0.4rem; padding: 0.5rem; }
+    .kpi .label { font-size: 0.85rem; color: #555; }
+    .kpi .value { font-size: 1.6rem; }
+    .kpi .delta { font-size: 0.85rem; color: #09ab3b; }
+    .row { display: flex; }
+    .row > div { flex: 1; }
+    .verdict { padding: 0.3rem 0.5rem; margin: 0.2rem 0; border-radius: 0.3rem; }
+    .success { background: #dff5e3; }
+    .warning { background: #fff5d6; }
+    .error { background: #fde1e1; }
+</style>
+</head>
+<body>
+<h1>🔬 Single Cell Protein (SCP) Scale-Up Analysis</h1>
+<h3>${title}</h3>
+<div class="kpis">${kpis}</div>
+<hr>
+<div class="row"><div>${fig_cost}</div><div>${fig_ghg}</div></div>
+<h2>Competitive Benchmarks</h2>
+<div class="row"><div>${fig_ghg_bench}</div><div>${fig_cost_bench}</div></div>
+<p><b>Competitive Position:</b></p>
+${verdicts}
+<hr>
+<p>Multiscale Bioprocess Optimization | SCP Production Analysis</p>
+</body>
+</html>
+""")
+
+# Columns written to the Excel summary, in order
+SUMMARY_COLUMNS = [
+    'reactors_needed', 'total_capex', 'capex_per_reactor', 'total_opex_per_kg',
+    'substrate_cost_per_kg', 'energy_cost_per_kg', 'labor_cost_per_kg', 'overhead_cost_per_kg',
+    'total_ghg', 'total_water', 'land_use_m2_per_kg', 'total_energy_kwh_per_kg', 'payback_years',
+    'dsp_capex', 'dsp_kwh_per_kg', 'dsp_binding_unit', 'dsp_binding_utilization',
+]
+
+# Full column list of summary.xlsx, so the table has a header even when every
+# scenario failed or the CSV had no rows
+SUMMARY_TABLE_COLUMNS = (['scenario', 'report', 'error'] + list(DEFAULT_INPUTS) + SUMMARY_COLUMNS +
+                         ['cost_verdict', 'ghg_verdict'])
+
+
+# ============================================================================
+# WORKER PROCESS
+# ============================================================================
+# Figures are built once per worker from the default scenario and then only
+# have their data swapped for each report. Building a figure through
+# plotly.express is far more expensive than updating a trace.
+_figures = None
+
+
+def _init_worker():
+    """Build the template figures once per worker process."""
+    global _figures
+    r = calculate_scenario(**DEFAULT_INPUTS)
+    fig_ghg_bench, fig_cost_bench = benchmark_figures(benchmark_table(r))
+    _figures = {
+        'cost': cost_figure(cost_table(r)),
+        'ghg': ghg_figure(ghg_table(r)),
+        'ghg_bench': fig_ghg_bench,
+        'cost_bench': fig_cost_bench,
+    }
+
+
+def _fig_html(fig):
+    return fig.to_html(full_html=False, include_plotlyjs=False)
+
+
+def render_report(r, title):
+    """Render one scenario's results to an HTML page.
+
+    The page is not self-contained: it loads plotly.min.js from its own
+    directory (export_reports() writes it there). Copied on its own, the page
+    shows the KPIs and verdicts but blank charts.
+    """
+    if _figures is None:
+        _init_worker()
+
+    # OPEX donut and GHG bar: one trace each
+    _figures['cost'].data[0].values = cost_table(r)['Cost ($/kg)'].tolist()
+    ghg_values = ghg_table(r)['Emissions (kg CO₂eq/kg)'].tolist()
+    _figures['ghg'].data[0].update(y=ghg_values, text=ghg_values)
+
+    # Benchmark bars: trace 0 is 'Your SCP', the literature traces never change
+    _figures['ghg_bench'].data[0].update(y=[r['total_ghg']], text=[r['total_ghg']])
+    _figures['cost_bench'].data[0].update(y=[r['total_opex_per_kg']], text=[r['total_opex_per_kg']])
+
+    kpis = ''.join(
+        f'<div class="kpi"><div class="label">{html.escape(label)}</div>'
+        f'<div class="value">{html.escape(value)}</div>'
+        f'<div class="delta">{html.escape(delta or "")}</div></div>'
+        for label, value, delta in kpi_cards(r)
+    )
+    verdicts = '\n'.join(
+        f'<div class="verdict {level}">{html.escape(message)}</div>'
+        for level, message in competitive_position(r)
+    )
+
+    return REPORT_TEMPLATE.substitute(
+        title=html.escape(title),
+        plotly_js=PLOTLY_JS_FILE,
+        kpis=kpis,
+        fig_cost=_fig_html(_figures['cost']),
+        fig_ghg=_fig_html(_figures['ghg']),
+        fig_ghg_bench=_fig_html(_figures['ghg_bench']),
+        fig_cost_bench=_fig_html(_figures['cost_bench']),
+        verdicts=verdicts,
+    )
+
+
+def _process_scenario(job):
+    """Calculate, render and write one report; return its summary row.
+
+    Errors are recorded in the row's 'error' column instead of being raised,
+    so one bad scenario does not stop the rest of the export.
+    """
+    title, inputs, path = job
+    row = {'scenario': title, 'report': os.path.basename(path), 'error': None}
+    row.update(inputs)
+    try:
+        r = calculate_scenario(**inputs)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render_report(r, title))
+    except Exception as e:
+        row['report'] = None
+        row['error'] = f"{type(e).__name__}: {e}"
+        return row
+
+    row.update({key: r[key] for key in SUMMARY_COLUMNS})
+    row['cost_verdict'], row['ghg_verdict'] = (level for level, _ in competitive_position(r))
+    return row
+
+
+# ============================================================================
+# BULK EXPORT
+# ============================================================================
+def _safe_filename(name):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('_') or 'scenario'
+
+
+def _scenario_inputs(row):
+    """Model inputs for one CSV row, typed like DEFAULT_INPUTS.
+
+    Blank cells and missing columns fall back to the slider defaults. pandas
+    reads a column with any blank cell as float, and a column with any text
+    cell as strings, so values are converted back cell by cell (otherwise
+    reports show e.g. "500.0m³ each"). Text that is not a number is kept as
+    is and reported in the summary's 'error' column.
+    """
+    inputs = {}
+    for key, default in DEFAULT_INPUTS.items():
+        value = row.get(key)
+        if isinstance(value, str):
+            try:
+                value = float(value)
+            except ValueError:
+                inputs[key] = value
+                continue
+        if pd.isna(value):
+            inputs[key] = default
+        elif isinstance(default, int) and isinstance(value, float) and value.is_integer():
+            inputs[key] = int(value)
+        elif isinstance(default, float) and isinstance(value, int):
+            inputs[key] = float(value)
+        else:
+            inputs[key] = value
+    return inputs
+
+
+def export_reports(scenarios, output_dir, workers=None):
+    """Render one HTML report per scenario and a summary.xlsx workbook.
+
+    scenarios: DataFrame with one row per scenario (see module docstring).
+    Returns the summary DataFrame.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Shared static asset, written once for all reports
+    with open(os.path.join(output_dir, PLOTLY_JS_FILE), 'w', encoding='utf-8') as f:
+        f.write(get_plotlyjs())
+
+    jobs = []
+    used_names = set()
+    for i, row in enumerate(scenarios.to_dict('records')):
+        name = row.get('scenario')
+        title = str(name) if pd.notna(name) and name != '' else f"scenario_{i + 1:05d}"
+        inputs = _scenario_inputs(row)
+        # Duplicate names get a numeric suffix that is not taken yet
+        base = filename = _safe_filename(title)
+        suffix = 1
+        while filename in used_names:
+            suffix += 1
+            filename = f"{base}_{suffix}"
+        used_names.add(filename)
+        jobs.append((title, inputs, os.path.join(output_dir, filename + '.html')))
+
+    workers = workers or os.cpu_count() or 1
+    # Large chunks keep inter-process overhead small with thousands of scenarios
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        rows = list(pool.map(_process_scenario, jobs, chunksize=chunksize))
+    summary = pd.DataFrame(rows, columns=SUMMARY_TABLE_COLUMNS)
+
+    with pd.ExcelWriter(os.path.join(output_dir, 'summary.xlsx')) as writer:
+        summary.to_excel(writer, sheet_name='Summary', index=False)
+        literature_benchmarks().to_excel(writer, sheet_name='Benchmarks', index=False)
+        pd.DataFrame({'Assumption': ['Selling price ($/kg)'], 'Value': [SELLING_PRICE]}).to_excel(
+            writer, sheet_name='Assumptions', index=False)
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export SCP scale-up reports for many scenarios.")
+    parser.add_argument('scenarios', help="CSV file with one scenario per row")
+    parser.add_argument('-o', '--output-dir', default='reports', help="Output directory (default: reports)")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="Number of worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    summary = export_reports(pd.read_csv(args.scenarios), args.output_dir, args.workers)
+    failed = int(summary['error'].notna().sum())
+    print(f"Wrote {len(summary) - failed} reports and summary.xlsx to {args.output_dir}")
+    if failed:
+        print(f"{failed} scenarios failed; see the 'error' column in summary.xlsx")
+
+
+if __name__ == '__main__':
+    main()
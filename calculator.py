@@ -1,8 +1,10 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-import numpy as np
+
+from scp_model import (
+    CONSTANTS, SELLING_PRICE, calculate_scenario, kpi_cards, cost_table, ghg_table,
+    benchmark_table, dsp_table, competitive_position, cost_figure, ghg_figure, benchmark_figures,
+)
+from app_resources import APP_CSS, track_session, memory_summary
 
 # ============================================================================
 # PAGE SETUP
@@ -17,165 +19,8 @@ st.set_page_config(
 # ============================================================================
 # CUSTOM CSS STYLING
 # ============================================================================
-
-st.markdown("""
-<style>
-    /* ===== SIDEBAR COMPACT ===== */
-    /* Remove gaps between sidebar elements */
-    [data-testid="stSidebar"] [data-testid="stVerticalBlock"] > [style*="flex-direction: column;"] > [data-testid="stVerticalBlock"] {
-        gap: 0rem !important;
-    }
-    /* Make sliders more compact */
-    [data-testid="stSidebar"] .stSlider {
-        padding-top: 0rem !important;
-        padding-bottom: 0.2rem !important;
-        margin-bottom: 0rem !important;
-    }
-    /* Remove extra spacing from sidebar elements */
-    [data-testid="stSidebar"] .element-container {
-        margin-bottom: 0rem !important;
-        margin-top: 0rem !important;
-        padding-bottom: 0rem !important;
-        padding-top: 0rem !important;
-    }
-    /* Make sidebar headers smaller */
-    [data-testid="stSidebar"] h2 {
-        margin-top: 0.3rem !important;
-        margin-bottom: 0.2rem !important;
-        padding-top: 0rem !important;
-        padding-bottom: 0rem !important;
-        font-size: 1rem !important;
-    }
-    /* Compact divider lines in sidebar */
-    [data-testid="stSidebar"] hr {
-        margin-top: 0.2rem !important;
-        margin-bottom: 0.2rem !important;
-    }
-    /* Compact dropdown boxes */
-    [data-testid="stSidebar"] .stSelectbox {
-        margin-bottom: 0rem !important;
-        padding-bottom: 0rem !important;
-    }
-    /* Reduce top padding of sidebar */
-    [data-testid="stSidebar"] > div:first-child {
-        padding-top: 1rem !important;
-    }
-    /* Compact slider labels */
-    [data-testid="stSidebar"] .stSlider label {
-        margin-bottom: 0.1rem !important;
-    }
-    /* Compact all form element labels */
-    [data-testid="stSidebar"] .stSelectbox label,
-    [data-testid="stSidebar"] .stNumberInput label {
-        margin-bottom: 0.1rem !important;
-    }
-    
-    /* ===== MAIN CONTENT EXTREMELY COMPACT ===== */
-    /* Remove spacing from main content elements */
-    .main .element-container {
-        margin-bottom: 0rem !important;
-        margin-top: 0rem !important;
-        padding-bottom: 0rem !important;
-        padding-top: 0rem !important;
-    }
-    /* Compact metric cards */
-    [data-testid="stMetric"] {
-        padding: 0.2rem 0.5rem !important;
-    }
-    [data-testid="stMetricLabel"] {
-        padding-bottom: 0rem !important;
-        margin-bottom: 0rem !important;
-    }
-    [data-testid="stMetricValue"] {
-        padding-top: 0rem !important;
-        margin-top: 0rem !important;
-    }
-    /* Compact main headers */
-    .main h1 {
-        margin-bottom: 0.2rem !important;
-        margin-top: 0rem !important;
-        padding-bottom: 0rem !important;
-        padding-top: 0rem !important;
-        line-height: 1.2 !important;
-    }
-    .main h2 {
-        margin-top: 0.2rem !important;
-        margin-bottom: 0.2rem !important;
-        padding: 0rem !important;
-        line-height: 1.2 !important;
-    }
-    .main h3 {
-        margin-top: 0.1rem !important;
-        margin-bottom: 0.1rem !important;
-        padding: 0rem !important;
-        line-height: 1.2 !important;
-    }
-    /* Compact divider lines */
-    .main hr {
-        margin-top: 0.3rem !important;
-        margin-bottom: 0.3rem !important;
-    }
-    /* Reduce gap between columns */
-    [data-testid="stHorizontalBlock"] {
-        gap: 0.3rem !important;
-    }
-    /* Compact tabs */
-    [data-testid="stTabs"] {
-        margin-top: 0.2rem !important;
-        margin-bottom: 0rem !important;
-    }
-    [data-testid="stTabContent"] {
-        padding-top: 0.3rem !important;
-        padding-bottom: 0rem !important;
-    }
-    /* Compact markdown text */
-    .main .stMarkdown {
-        margin-bottom: 0rem !important;
-        margin-top: 0rem !important;
-        padding-bottom: 0rem !important;
-        padding-top: 0rem !important;
-    }
-    .main .stMarkdown p {
-        margin-bottom: 0.2rem !important;
-        margin-top: 0rem !important;
-    }
-    /* Compact charts */
-    .main .stPlotlyChart {
-        margin-top: 0rem !important;
-        margin-bottom: 0rem !important;
-        padding-top: 0rem !important;
-        padding-bottom: 0rem !important;
-    }
-    /* Reduce main page top padding */
-    .main > div {
-        padding-top: 0.5rem !important;
-    }
-    /* Remove gaps in vertical layouts */
-    .main [data-testid="stVerticalBlock"] {
-        gap: 0rem !important;
-    }
-    /* Compact paragraphs */
-    .main p {
-        margin-bottom: 0.1rem !important;
-        margin-top: 0rem !important;
-    }
-    /* Compact lists */
-    .main ul, .main ol {
-        margin-top: 0rem !important;
-        margin-bottom: 0.2rem !important;
-        padding-top: 0rem !important;
-    }
-    .main li {
-        margin-bottom: 0.1rem !important;
-    }
-    /* Compact alert messages */
-    .main .stSuccess, .main .stWarning, .main .stError {
-        padding: 0.3rem 0.5rem !important;
-        margin-top: 0.2rem !important;
-        margin-bottom: 0.2rem !important;
-    }
-</style>
-""", unsafe_allow_html=True)
+# The stylesheet is a process-wide constant in app_resources.py
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 # ============================================================================
 # PAGE TITLE AND HEADER
@@ -185,28 +30,6 @@ st.markdown("**Interactive tool for bioprocess optimization and the economic ana
 st.markdown("*By Susi | ⚠️ For demonstration purposes only*")
 st.markdown("---") 
 
-# ============================================================================
-# ENGINEERING CONSTANTS
-# ============================================================================
-# These are fixed values based on literature and industry standards
-# They represent typical bioprocess parameters
-CONSTANTS = {
-    'reactor_volume_L': 100_000,  # 100 m³ working volume (standard industrial size)
-    'operating_hours_year': 8000,  # 91% uptime (allows for maintenance/downtime)
-    'substrate_price_per_kg': 0.50,  # USD/kg (glucose - typical market price)
-    'electricity_price': 0.12,  # USD/kWh (industrial electricity rate)
-    'grid_emission_factor': 0.07,  # kg CO2 / kWh (renewable grid assumption)
-    'mixing_power_per_m3': 1.0,  # kW/m³ (power needed to mix the bioreactor)
-    'heat_per_kg_biomass': 4000,  # kcal/kg (metabolic heat generated)
-    'cooling_water_base': 20,  # L/kg protein (base cooling water requirement)
-    'reactor_base_cost': 6,  # Million USD for 100m³ reactor
-    'scaling_exponent': 0.6,  # Six-tenths rule for equipment cost scaling
-    'operators_per_reactor': 0.5,  # operators/reactor/shift (industry standard)
-    'operator_salary_year': 60_000,  # USD/year per operator
-    'base_footprint_m2': 500,  # m² for first reactor (includes utilities)
-    'additional_reactor_footprint': 400,  # m² for each additional reactor
-}
-
 # ============================================================================
 # SIDEBAR - USER INPUT PARAMETERS
 # ============================================================================
@@ -313,199 +136,43 @@ energy_price = st.sidebar.slider(
 )
 
 # ============================================================================
-# DERIVED CALCULATIONS - Basic Performance Metrics
-# ============================================================================
-# These are calculated from the user inputs above
-
-# Calculate protein concentration (g/L)
-# Formula: biomass × protein percentage
-protein_concentration = final_biomass * (protein_content_pct / 100)
-
-# Calculate biomass productivity (g/L/h)
-# Formula: final biomass ÷ time
-biomass_productivity = final_biomass / fermentation_time
-
-# Calculate protein productivity (g/L/h) - KEY METRIC
-# Formula: protein concentration ÷ time
-protein_productivity = protein_concentration / fermentation_time
-
-# ============================================================================
-# FED-BATCH SUBSTRATE CALCULATIONS
+# CALCULATIONS
 # ============================================================================
-# Fed-batch: substrate is added gradually during fermentation
-# This prevents inhibition and achieves higher cell density
-
-S_initial = 35  # g/L - Initial substrate in batch phase
-S_total_fed = 165  # g/L - Total substrate added throughout fermentation
-S_residual = 5.0  # g/L - Substrate remaining at end (not consumed)
-
-# Calculate actual substrate consumed
-substrate_consumed = S_total_fed - S_residual
-
-# Calculate substrate needed per kg of protein produced
-# This is a key economic metric
-substrate_kg_per_kg_protein = substrate_consumed / protein_concentration
-
-# ============================================================================
-# REACTOR SCALE-UP CALCULATIONS
-# ============================================================================
-# Calculate how many reactors are needed to hit production target
-
-# Convert reactor volume to working volume
-working_volume_m3 = reactor_volume * 0.8  # 80% working volume (safety margin)
-working_volume_L = working_volume_m3 * 1000  # Convert m³ to liters
-
-# Time between batches
-turnaround_time = 24  # hours for cleaning, sterilization, preparation
-cycle_time = fermentation_time + turnaround_time  # Total time per batch
-
-# How many batches can we run per year?
-batches_per_year = CONSTANTS['operating_hours_year'] / cycle_time
-
-# How much protein per batch?
-# Formula: (protein conc in g/L) × (volume in L) ÷ 1000 = kg
-protein_per_batch = (protein_concentration * working_volume_L) / 1000  # kg
-
-# Annual capacity of ONE reactor (tons/year)
-annual_capacity_per_reactor = protein_per_batch * batches_per_year / 1000  # convert kg to tons
-
-# How many reactors do we need? (round up to nearest whole number)
-reactors_needed = np.ceil(target_production / annual_capacity_per_reactor)
-
-# ============================================================================
-# ECONOMIC CALCULATIONS - CAPEX (Capital Expenditure)
-# ============================================================================
-# CAPEX = one-time investment in equipment/facilities
-
-# Use "six-tenths rule" for equipment cost scaling
-# Cost scales with size^0.6 (not linearly)
-reactor_size_ratio = reactor_volume / 100  # Ratio to base size (100 m³)
-capex_per_reactor = CONSTANTS['reactor_base_cost'] * (reactor_size_ratio ** CONSTANTS['scaling_exponent'])
-
-# Total CAPEX = cost per reactor × number of reactors
-total_capex = capex_per_reactor * reactors_needed
-
-# ============================================================================
-# ECONOMIC CALCULATIONS - OPEX (Operating Expenditure)
-# ============================================================================
-# OPEX = recurring costs per year
-
-# --- 1. SUBSTRATE COST (usually 60-65% of OPEX) ---
-# Cost = (kg substrate / kg protein) × (price per kg substrate)
-substrate_cost_per_kg = substrate_kg_per_kg_protein * substrate_price
-
-# --- 2. ENERGY COST ---
-# Convert annual capacity to kg for calculations
-protein_per_reactor_kg_year = annual_capacity_per_reactor * 1000  # tons to kg
-
-# Mixing energy (kWh per kg protein)
-# Formula: (power per m³) × (reactor volume) × (hours per year) ÷ (annual production)
-mixing_kwh_per_kg = (
-    CONSTANTS['mixing_power_per_m3'] *  # kW/m³ (1.0)
-    reactor_volume *  # m³
-    CONSTANTS['operating_hours_year']  # h/year (8000)
-) / protein_per_reactor_kg_year  # Divide by annual production in kg
-
-# Cooling energy (kWh per kg protein)
-# Calculate heat generated from fermentation
-heat_generated_kcal_L = final_biomass * CONSTANTS['heat_per_kg_biomass'] / 1000
-cooling_kwh_per_kg = heat_generated_kcal_L * 0.001  # Convert kcal to kWh (simplified)
-
-# Total energy consumption per kg protein
-total_energy_kwh_per_kg = mixing_kwh_per_kg + cooling_kwh_per_kg
-
-# Energy cost = energy consumed × price per kWh
-energy_cost_per_kg = total_energy_kwh_per_kg * energy_price
-
-# --- 3. LABOR COST ---
-# Total operators needed = reactors × operators per reactor
-total_operators = reactors_needed * CONSTANTS['operators_per_reactor']
-
-# Labor cost per kg = (total operators × salary) ÷ (annual production in kg)
-labor_cost_per_kg = (total_operators * CONSTANTS['operator_salary_year']) / (target_production * 1000)
-
-# --- 4. OVERHEAD COST ---
-# Overhead includes: maintenance, QA/QC, administration, insurance
-# Typically 30-40% of direct costs (substrate + energy + labor)
-overhead_cost_per_kg = (substrate_cost_per_kg + energy_cost_per_kg + labor_cost_per_kg) * 0.4
-
-# --- 5. TOTAL OPEX ---
-# Sum of all operating costs per kg protein
-total_opex_per_kg = substrate_cost_per_kg + energy_cost_per_kg + labor_cost_per_kg + overhead_cost_per_kg
-
-# ============================================================================
-# ENVIRONMENTAL IMPACT CALCULATIONS
-# ============================================================================
-
-# --- GHG (Greenhouse Gas) Emissions ---
-# Substrate emissions (from growing/processing glucose)
-substrate_emissions = substrate_kg_per_kg_protein * 0.25  # kg CO2 per kg glucose
-
-# Energy emissions (from electricity generation)
-energy_emissions = total_energy_kwh_per_kg * CONSTANTS['grid_emission_factor']
-
-# Total GHG emissions per kg protein
-total_ghg = substrate_emissions + energy_emissions
-
-# --- Water Use ---
-# Calculate heat load to determine cooling water needs
-heat_load_factor = heat_generated_kcal_L / 20_000
-
-# Cooling water requirement
-cooling_water_L_per_kg = CONSTANTS['cooling_water_base'] * (1 + heat_load_factor * 0.5)
-
-# Process water (for medium preparation, cleaning, etc.)
-process_water_L_per_kg = 12
-
-# Total water consumption per kg protein
-total_water = cooling_water_L_per_kg + process_water_L_per_kg
-
-# --- Land Use ---
-# Calculate factory footprint based on number of reactors
-if reactors_needed == 1:
-    total_factory_footprint = CONSTANTS['base_footprint_m2']
-else:
-    # Base footprint + additional space for each extra reactor
-    total_factory_footprint = (CONSTANTS['base_footprint_m2'] + 
-                              (reactors_needed - 1) * CONSTANTS['additional_reactor_footprint'])
+# All scale-up, cost and environmental formulas live in scp_model.py so the
+# same numbers can be produced without the browser (see bulk_report.py).
+# The calculation takes ~0.1 ms, so results, tables and figures are rebuilt
+# on every run and freed when it ends instead of being cached per input set.
+track_session()
+results = calculate_scenario(
+    mu_max=mu_max,
+    Yx_s=Yx_s,
+    protein_content_pct=protein_content_pct,
+    final_biomass=final_biomass,
+    fermentation_time=fermentation_time,
+    target_production=target_production,
+    reactor_volume=reactor_volume,
+    substrate_price=substrate_price,
+    energy_price=energy_price,
+)
 
-# Land use per kg protein produced
-land_use_m2_per_kg = total_factory_footprint / (target_production * 1000)
-land_use_cm2_per_kg = land_use_m2_per_kg * 10000  # Convert to cm² for easier reading
+# Unpack the values used repeatedly below
+reactors_needed = results['reactors_needed']
+total_opex_per_kg = results['total_opex_per_kg']
+total_capex = results['total_capex']
+total_ghg = results['total_ghg']
+substrate_emissions = results['substrate_emissions']
+energy_emissions = results['energy_emissions']
+total_water = results['total_water']
+total_factory_footprint = results['total_factory_footprint']
+annual_capacity_per_reactor = results['annual_capacity_per_reactor']
 
 # ============================================================================
 # DISPLAY RESULTS - TOP METRICS
 # ============================================================================
 # Create 4 columns for key performance indicators (KPIs)
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    st.metric(
-        label="🏭 Reactors Needed",
-        value=f"{int(reactors_needed)}",
-        delta=f"{reactor_volume}m³ each"  # Shows reactor size below
-    )
-
-with col2:
-    st.metric(
-        label="💰 Total OPEX",
-        value=f"${total_opex_per_kg:.2f}/kg",
-        delta=f"${substrate_cost_per_kg:.2f} substrate" if substrate_cost_per_kg > total_opex_per_kg * 0.4 else None
-    )
-
-with col3:
-    st.metric(
-        label="🏗️ CAPEX",
-        value=f"${total_capex:.1f}M",
-        delta=f"${capex_per_reactor:.1f}M per reactor"
-    )
-
-with col4:
-    st.metric(
-        label="🌍 GHG Emissions",
-        value=f"{total_ghg:.2f} kg CO₂eq/kg",
-        delta="30× less than beef" if total_ghg < 2.0 else None
-    )
+for col, (label, value, delta) in zip(st.columns(4), kpi_cards(results)):
+    with col:
+        st.metric(label=label, value=value, delta=delta)
 
 st.markdown("---")  # Separator line
 
@@ -519,22 +186,9 @@ tab1, tab2, tab3, tab4 = st.tabs(["📊 Cost Breakdown", "🏭 Production Detail
 with tab1:
     st.subheader("Cost Breakdown")
     
-    # Create DataFrame for cost components
-    cost_data = pd.DataFrame({
-        'Category': ['Substrate', 'Energy', 'Labor', 'Overhead'],
-        'Cost ($/kg)': [substrate_cost_per_kg, energy_cost_per_kg, labor_cost_per_kg, overhead_cost_per_kg]
-    })
-    
-    # Create pie chart showing OPEX breakdown
-    fig_cost = px.pie(
-        cost_data,
-        values='Cost ($/kg)',
-        names='Category',
-        title='OPEX Breakdown',
-        hole=0.4  # Makes it a donut chart
-    )
-    fig_cost.update_traces(textposition='inside', textinfo='percent+label')
-    st.plotly_chart(fig_cost, use_container_width=True)
+    # Cost components table and OPEX donut chart
+    cost_data = cost_table(results)
+    st.plotly_chart(cost_figure(cost_data), use_container_width=True)
     
     # Create 2 columns for detailed cost information
     col1, col2 = st.columns(2)
@@ -550,22 +204,17 @@ with tab1:
         st.markdown("**Key Metrics:**")
         st.write(f"- Total OPEX: **${total_opex_per_kg:.2f}/kg**")
         st.write(f"- Annual OPEX: **${(total_opex_per_kg * target_production * 1000 / 1e6):.2f}M**")
-        st.write(f"- CAPEX: **${total_capex:.2f}M**")
+        st.write(f"- CAPEX: **${total_capex:.2f}M** (downstream: ${results['dsp_capex']:.2f}M)")
         
-        # Calculate payback period
-        selling_price = 10.0  # Assumed selling price in $/kg
-        if total_opex_per_kg < selling_price:
-            # Annual profit = (selling price - OPEX) × production volume
-            annual_profit = (selling_price - total_opex_per_kg) * target_production * 1000
-            # Payback = CAPEX ÷ annual profit
-            payback_years = (total_capex * 1_000_000) / annual_profit
-            
+        # Payback period at the assumed selling price
+        payback_years = results['payback_years']
+        if payback_years is not None:
             if payback_years < 20:
-                st.write(f"- Payback period: **{payback_years:.1f} years** (assuming ${selling_price}/kg selling price)")
+                st.write(f"- Payback period: **{payback_years:.1f} years** (assuming ${SELLING_PRICE}/kg selling price)")
             else:
                 st.write(f"- Payback period: **>20 years** (not viable)")
         else:
-            st.write(f"- Payback period: **Not viable** (OPEX ${total_opex_per_kg:.2f}/kg > ${selling_price}/kg selling price)")
+            st.write(f"- Payback period: **Not viable** (OPEX ${total_opex_per_kg:.2f}/kg > ${SELLING_PRICE}/kg selling price)")
 
 # --- TAB 2: PRODUCTION DETAILS ---
 with tab2:
@@ -579,20 +228,30 @@ with tab2:
         st.write(f"- Max growth rate: {mu_max:.3f} h⁻¹")
         st.write(f"- Biomass yield: {Yx_s:.3f} g/g")
         st.write(f"- Final biomass: {final_biomass:.1f} g/L")
-        st.write(f"- Final protein: {protein_concentration:.1f} g/L")
-        st.write(f"- Biomass productivity: {biomass_productivity:.2f} g/L/h")
-        st.write(f"- Protein productivity: {protein_productivity:.2f} g/L/h")
+        st.write(f"- Final protein: {results['protein_concentration']:.1f} g/L")
+        st.write(f"- Biomass productivity: {results['biomass_productivity']:.2f} g/L/h")
+        st.write(f"- Protein productivity: {results['protein_productivity']:.2f} g/L/h")
         st.write(f"- Fermentation time: {fermentation_time}h")
         
     with col2:
         st.markdown("**Scale-Up Parameters:**")
-        st.write(f"- Reactor size: {reactor_volume}m³ (working: {working_volume_m3}m³)")
+        st.write(f"- Reactor size: {reactor_volume}m³ (working: {results['working_volume_m3']}m³)")
         st.write(f"- Reactors needed: **{int(reactors_needed)}**")
-        st.write(f"- Cycle time: {cycle_time}h (ferment + turnaround)")
-        st.write(f"- Batches per year: {batches_per_year:.0f}")
-        st.write(f"- Protein per batch: {protein_per_batch:.0f} kg")
+        st.write(f"- Cycle time: {results['cycle_time']}h (ferment + turnaround)")
+        st.write(f"- Batches per year: {results['batches_per_year']:.0f}")
+        st.write(f"- Protein per batch: {results['protein_per_batch']:.0f} kg")
         st.write(f"- Annual capacity: {annual_capacity_per_reactor * reactors_needed:.0f} tons")
 
+    # Downstream processing: harvests from all reactors queue for the DSP units
+    st.markdown("**Downstream Processing:**")
+    dsp = results['dsp']
+    st.write(f"- Harvests arriving: {reactors_needed / results['cycle_time']:.3f} batches/h "
+             f"(DSP can take up to {dsp['max_arrival_rate']:.3f} batches/h)")
+    st.write(f"- Binding unit: **{results['dsp_binding_unit']}** "
+             f"({results['dsp_binding_utilization'] * 100:.0f}% utilized)")
+    st.write(f"- DSP energy: {results['dsp_kwh_per_kg']:.2f} kWh/kg protein")
+    st.dataframe(dsp_table(results).round(2), hide_index=True, use_container_width=True)
+
 # --- TAB 3: ENVIRONMENTAL IMPACT ---
 with tab3:
     st.subheader("Environmental Impact")
@@ -602,22 +261,8 @@ with tab3:
     
     with col1:
         st.markdown("**GHG Emissions Breakdown:**")
-        # Create DataFrame for GHG sources
-        ghg_data = pd.DataFrame({
-            'Source': ['Substrate Production', 'Energy Use'],
-            'Emissions (kg CO₂eq/kg)': [substrate_emissions, energy_emissions]
-        })
-        
-        # Create bar chart
-        fig_ghg = px.bar(
-            ghg_data,
-            x='Source',
-            y='Emissions (kg CO₂eq/kg)',
-            title='GHG Emissions by Source',
-            text='Emissions (kg CO₂eq/kg)'
-        )
-        fig_ghg.update_traces(texttemplate='%{text:.2f}', textposition='outside')
-        st.plotly_chart(fig_ghg, use_container_width=True)
+        # Create bar chart of GHG sources
+        st.plotly_chart(ghg_figure(ghg_table(results)), use_container_width=True)
     
     with col2:
         st.markdown("**Environmental Metrics:**")
@@ -625,8 +270,8 @@ with tab3:
         st.write(f"  - Substrate: {substrate_emissions:.2f} kg ({substrate_emissions/total_ghg*100:.0f}%)")
         st.write(f"  - Energy: {energy_emissions:.2f} kg ({energy_emissions/total_ghg*100:.0f}%)")
         st.write(f"- **Water use:** {total_water:.1f} L/kg protein")
-        st.write(f"- **Land use:** {land_use_m2_per_kg:.5f} m²/kg ({land_use_cm2_per_kg:.1f} cm²/kg)")
-        st.write(f"- **Energy consumption:** {total_energy_kwh_per_kg:.1f} kWh/kg protein")
+        st.write(f"- **Land use:** {results['land_use_m2_per_kg']:.5f} m²/kg ({results['land_use_cm2_per_kg']:.1f} cm²/kg)")
+        st.write(f"- **Energy consumption:** {results['total_energy_kwh_per_kg']:.1f} kWh/kg protein")
         
         st.markdown("**Annual Impact:**")
         # Calculate total annual environmental impact
@@ -641,65 +286,45 @@ with tab3:
 with tab4:
     st.subheader("Competitive Benchmarks")
     
-    # Create benchmark comparison data (from literature)
-    benchmark_data = pd.DataFrame({
-        'Protein Source': ['Your SCP', 'Beef', 'Chicken', 'Pork', 'Soy', 'Pea'],
-        'GHG (kg CO₂eq/kg)': [total_ghg, 50, 8, 13, 2.5, 1.5],
-        'Water (L/kg)': [total_water, 15000, 4000, 6000, 2500, 1500],
-        'Land (m²/kg)': [land_use_m2_per_kg, 250, 45, 55, 15, 8],
-        'Cost ($/kg)': [total_opex_per_kg, 6.0, 4.0, 4.5, 2.2, 2.7]
-    })
+    # Your SCP alongside literature values (beef, chicken, pork, soy, pea)
+    fig_ghg_bench, fig_cost_bench = benchmark_figures(benchmark_table(results))
     
     # Create 2 columns for comparison charts
     col1, col2 = st.columns(2)
     
     with col1:
         # GHG comparison chart
-        fig_ghg_bench = px.bar(
-            benchmark_data,
-            x='Protein Source',
-            y='GHG (kg CO₂eq/kg)',
-            title='GHG Emissions Comparison',
-            text='GHG (kg CO₂eq/kg)',
-            color='Protein Source'
-        )
-        fig_ghg_bench.update_traces(texttemplate='%{text:.1f}', textposition='outside')
         st.plotly_chart(fig_ghg_bench, use_container_width=True)
     
     with col2:
         # Cost comparison chart
-        fig_cost_bench = px.bar(
-            benchmark_data,
-            x='Protein Source',
-            y='Cost ($/kg)',
-            title='Production Cost Comparison',
-            text='Cost ($/kg)',
-            color='Protein Source'
-        )
-        fig_cost_bench.update_traces(texttemplate='$%{text:.2f}', textposition='outside')
         st.plotly_chart(fig_cost_bench, use_container_width=True)
 
         # Provide competitive position assessment
 st.markdown("**Competitive Position:**")
 
-# Check if cost is competitive
-if total_opex_per_kg < 2.5:
-    st.success(f"✅ Your SCP cost (${total_opex_per_kg:.2f}/kg) is competitive with plant proteins")
-elif total_opex_per_kg < 4.0:
-    st.warning(f"⚠️ Your SCP cost (${total_opex_per_kg:.2f}/kg) is between plant and animal proteins")
-else:
-    st.error(f"❌ Your SCP cost (${total_opex_per_kg:.2f}/kg) is above animal proteins - optimization needed")
+# Cost and GHG verdicts rendered as st.success / st.warning / st.error
+for level, message in competitive_position(results):
+    getattr(st, level)(message)
 
-# Check if GHG is competitive
-if total_ghg < 3.0:
-    st.success(f"✅ Your SCP GHG ({total_ghg:.2f} kg CO₂eq/kg) is competitive with plant proteins")
-else:
-    st.warning(f"⚠️ Your SCP GHG ({total_ghg:.2f} kg CO₂eq/kg) needs optimization")
+# ============================================================================
+# MEMORY PANEL (open the app with ?memory=1)
+# ============================================================================
+if st.query_params.get("memory") == "1":
+    mem = memory_summary()
+    with st.sidebar.expander("🧠 Memory (process-level estimate)", expanded=True):
+        if mem['rss_bytes'] is not None:
+            st.write(f"- Process RSS: {mem['rss_bytes'] / 1e6:.1f} MB")
+            st.write(f"- Baseline RSS: {mem['baseline_rss_bytes'] / 1e6:.1f} MB")
+        st.write(f"- Live sessions: {mem['live_sessions']}")
+        if mem['avg_rss_per_session_bytes'] is not None:
+            st.write(f"- Avg. RSS above baseline per live session: "
+                     f"{mem['avg_rss_per_session_bytes'] / 1e3:.0f} kB")
+        st.caption("Whole-process RSS divided by live sessions, not a measurement "
+                   "of any one session's objects.")
 
 #===========================================================================
 # FOOTER
 #============================================================================
 st.markdown("---")
 st.markdown("Multiscale Bioprocess Optimization | SCP Production Analysis")
-
-        
\ No newline at end of file
@@ -0,0 +1,472 @@
+"""
+SCP scale-up model shared by the Streamlit app and the bulk report exporter.
+
+Everything in here is free of Streamlit calls so it can be imported from
+worker processes that render reports without a browser.
+"""
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+# ============================================================================
+# ENGINEERING CONSTANTS
+# ============================================================================
+# These are fixed values based on literature and industry standards
+# They represent typical bioprocess parameters
+# Read-only so one copy can be shared by every session in the process
+CONSTANTS = MappingProxyType({
+    'reactor_volume_L': 100_000,  # 100 m³ working volume (standard industrial size)
+    'operating_hours_year': 8000,  # 91% uptime (allows for maintenance/downtime)
+    'substrate_price_per_kg': 0.50,  # USD/kg (glucose - typical market price)
+    'electricity_price': 0.12,  # USD/kWh (industrial electricity rate)
+    'grid_emission_factor': 0.07,  # kg CO2 / kWh (renewable grid assumption)
+    'mixing_power_per_m3': 1.0,  # kW/m³ (power needed to mix the bioreactor)
+    'heat_per_kg_biomass': 4000,  # kcal/kg (metabolic heat generated)
+    'cooling_water_base': 20,  # L/kg protein (base cooling water requirement)
+    'reactor_base_cost': 6,  # Million USD for 100m³ reactor
+    'scaling_exponent': 0.6,  # Six-tenths rule for equipment cost scaling
+    'operators_per_reactor': 0.5,  # operators/reactor/shift (industry standard)
+    'operator_salary_year': 60_000,  # USD/year per operator
+    'base_footprint_m2': 500,  # m² for first reactor (includes utilities)
+    'additional_reactor_footprint': 400,  # m² for each additional reactor
+})
+
+# Default scenario inputs (same values the sidebar sliders start at)
+DEFAULT_INPUTS = MappingProxyType({
+    'mu_max': 0.45,  # h⁻¹
+    'Yx_s': 0.52,  # g/g
+    'protein_content_pct': 65,  # % of dry biomass
+    'final_biomass': 70.0,  # g/L
+    'fermentation_time': 42,  # hours
+    'target_production': 1000,  # tons protein/year
+    'reactor_volume': 100,  # m³
+    'substrate_price': CONSTANTS['substrate_price_per_kg'],  # $/kg
+    'energy_price': CONSTANTS['electricity_price'],  # $/kWh
+})
+
+# Literature values for competing protein sources
+# (GHG kg CO₂eq/kg, water L/kg, land m²/kg, cost $/kg)
+# Stored as tuples so no caller can change them; use
+# literature_benchmarks() for a DataFrame
+BENCHMARKS = MappingProxyType({
+    'Protein Source': ('Beef', 'Chicken', 'Pork', 'Soy', 'Pea'),
+    'GHG (kg CO₂eq/kg)': (50, 8, 13, 2.5, 1.5),
+    'Water (L/kg)': (15000, 4000, 6000, 2500, 1500),
+    'Land (m²/kg)': (250, 45, 55, 15, 8),
+    'Cost ($/kg)': (6.0, 4.0, 4.5, 2.2, 2.7),
+})
+
+SELLING_PRICE = 10.0  # Assumed selling price in $/kg (used for payback)
+
+# Downstream processing (DSP) units, in process order
+# 'feed' is what the unit processes: whole 'broth' or centrifuge 'concentrate'
+DSP_UNITS = MappingProxyType({
+    'Centrifugation': MappingProxyType({
+        'feed': 'broth',
+        'capacity_m3_h': 40,  # m³ feed/h per disc-stack centrifuge
+        'kwh_per_m3': 1.0,  # kWh/m³ feed
+        'unit_cost': 1.2,  # Million USD per unit
+    }),
+    'Cell Disruption': MappingProxyType({
+        'feed': 'concentrate',
+        'capacity_m3_h': 8,  # m³ feed/h per high-pressure homogenizer
+        'kwh_per_m3': 3.0,  # kWh/m³ feed (single pass at ~800 bar)
+        'unit_cost': 0.9,  # Million USD per unit
+    }),
+    'Spray Drying': MappingProxyType({
+        'feed': 'concentrate',
+        'capacity_m3_h': 4,  # m³ feed/h per spray dryer
+        'kwh_per_m3': 800,  # kWh/m³ feed (~1 kWh per kg water evaporated)
+        'unit_cost': 3.5,  # Million USD per unit
+    }),
+})
+
+DSP_CONSTANTS = MappingProxyType({
+    'concentrate_solids_g_L': 200,  # g/L dry cells leaving the centrifuge
+    'target_utilization': 0.85,  # Units are added until utilization is below this
+    'arrival_cv2': 1.0,  # Squared CV of harvest inter-arrival times (random end of fermentation)
+    'service_cv2': 0.1,  # Squared CV of unit processing times (nearly constant flow rate)
+    'buffer_safety_factor': 2.0,  # Buffer holds this many times the mean queue
+    'buffer_tank_base_cost': 0.25,  # Million USD for 100 m³ buffer tank
+})
+
+
+# ============================================================================
+# DOWNSTREAM PROCESSING - QUEUEING MODEL
+# ============================================================================
+def downstream_processing(reactors_needed, cycle_time, working_volume_m3, final_biomass,
+                          protein_per_batch):
+    """Size the DSP train and find its binding unit.
+
+    Every reactor harvests once per cycle, so batches arrive at the DSP at
+    λ = reactors / cycle time. Each stage is a G/G/c queue: c parallel units
+    are added until utilization ρ = λ·s/c is below the target, where s is the
+    time one unit needs for one batch. The mean wait uses the Sakasegawa
+    approximation and the buffer tank in front of each stage holds one batch
+    plus a safety margin on the mean queue (Little's law: Lq = λ·Wq).
+
+    Closed form and vectorized: the inputs are broadcast against each other,
+    so scalar inputs give one value per stage and inputs that broadcast to
+    shape (n,) give arrays of shape (n_stages, n).
+    """
+    reactors_needed, cycle_time, working_volume_m3, final_biomass, protein_per_batch = (
+        np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (
+            reactors_needed, cycle_time, working_volume_m3, final_biomass, protein_per_batch))))
+
+    # Stage parameters as column vectors so they broadcast against the inputs
+    units = list(DSP_UNITS.values())
+    stage_shape = (len(units),) + (1,) * reactors_needed.ndim
+    capacity = np.array([u['capacity_m3_h'] for u in units]).reshape(stage_shape)
+    kwh_per_m3 = np.array([u['kwh_per_m3'] for u in units]).reshape(stage_shape)
+    unit_cost = np.array([u['unit_cost'] for u in units]).reshape(stage_shape)
+    is_concentrate = np.array([u['feed'] == 'concentrate' for u in units]).reshape(stage_shape)
+
+    # Feed volume per batch: whole broth, or broth concentrated to the centrifuge solids
+    concentrate_fraction = np.minimum(final_biomass / DSP_CONSTANTS['concentrate_solids_g_L'], 1.0)
+    feed_m3 = working_volume_m3 * np.where(is_concentrate, concentrate_fraction, 1.0)
+
+    # Arrival rate (batches/h) and processing time per batch on one unit (h)
+    arrival_rate = reactors_needed / cycle_time
+    service_h = feed_m3 / capacity
+
+    # Parallel units needed to stay below the target utilization
+    offered_load = arrival_rate * service_h  # Busy units needed on average
+    n_units = np.maximum(np.ceil(offered_load / DSP_CONSTANTS['target_utilization']), 1)
+    utilization = offered_load / n_units
+
+    # Sakasegawa approximation for the mean wait in a G/G/c queue
+    variability = (DSP_CONSTANTS['arrival_cv2'] + DSP_CONSTANTS['service_cv2']) / 2
+    wait_h = (variability * service_h *
+              utilization ** (np.sqrt(2 * (n_units + 1)) - 1) / (n_units * (1 - utilization)))
+    mean_queue = arrival_rate * wait_h  # Batches waiting (Little's law)
+
+    # Buffer tank: one full harvest plus the safety margin on the mean queue
+    buffer_m3 = feed_m3 * (1 + DSP_CONSTANTS['buffer_safety_factor'] * mean_queue)
+    buffer_cost = (DSP_CONSTANTS['buffer_tank_base_cost'] *
+                   (buffer_m3 / 100) ** CONSTANTS['scaling_exponent'])
+
+    # The binding unit is the most heavily loaded stage
+    binding = np.argmax(utilization, axis=0)
+    names = np.array(list(DSP_UNITS.keys()))
+
+    return {
+        'stages': list(DSP_UNITS.keys()),
+        'feed_m3': feed_m3,
+        'n_units': n_units,
+        'utilization': utilization,
+        'wait_h': wait_h,
+        'buffer_m3': buffer_m3,
+        'capex': n_units * unit_cost + buffer_cost,  # Million USD per stage
+        'kwh_per_kg': kwh_per_m3 * feed_m3 / protein_per_batch,  # kWh/kg protein per stage
+        # Most batches/h the installed units can take, set by the binding stage
+        'max_arrival_rate': np.min(n_units / service_h, axis=0),
+        'binding_unit': names[binding],
+        'binding_utilization': np.max(utilization, axis=0),
+    }
+
+
+# ============================================================================
+# SCENARIO CALCULATION
+# ============================================================================
+def calculate_scenario(mu_max, Yx_s, protein_content_pct, final_biomass, fermentation_time,
+                       target_production, reactor_volume, substrate_price, energy_price):
+    """Run the full scale-up, cost and environmental model for one scenario.
+
+    Returns a dict with every derived quantity shown in the app. Inputs are
+    scalars; to evaluate many scenarios at once, call downstream_processing()
+    directly, which is vectorized.
+    """
+    # --- Basic performance metrics ---
+    # Protein concentration (g/L) = biomass × protein percentage
+    protein_concentration = final_biomass * (protein_content_pct / 100)
+    # Biomass productivity (g/L/h) = final biomass ÷ time
+    biomass_productivity = final_biomass / fermentation_time
+    # Protein productivity (g/L/h) - KEY METRIC
+    protein_productivity = protein_concentration / fermentation_time
+
+    # --- Fed-batch substrate ---
+    # Fed-batch: substrate is added gradually during fermentation
+    # This prevents inhibition and achieves higher cell density
+    S_total_fed = 165  # g/L - Total substrate added throughout fermentation
+    S_residual = 5.0  # g/L - Substrate remaining at end (not consumed)
+    substrate_consumed = S_total_fed - S_residual
+    # Substrate needed per kg of protein produced (key economic metric)
+    substrate_kg_per_kg_protein = substrate_consumed / protein_concentration
+
+    # --- Reactor scale-up ---
+    working_volume_m3 = reactor_volume * 0.8  # 80% working volume (safety margin)
+    working_volume_L = working_volume_m3 * 1000  # Convert m³ to liters
+    turnaround_time = 24  # hours for cleaning, sterilization, preparation
+    cycle_time = fermentation_time + turnaround_time  # Total time per batch
+    batches_per_year = CONSTANTS['operating_hours_year'] / cycle_time
+    # (protein conc in g/L) × (volume in L) ÷ 1000 = kg
+    protein_per_batch = (protein_concentration * working_volume_L) / 1000
+    annual_capacity_per_reactor = protein_per_batch * batches_per_year / 1000  # tons/year
+    # How many reactors do we need? (round up to nearest whole number)
+    reactors_needed = np.ceil(target_production / annual_capacity_per_reactor)
+
+    # --- Downstream processing ---
+    # Centrifugation, cell disruption and spray drying of every harvest
+    dsp = downstream_processing(reactors_needed, cycle_time, working_volume_m3, final_biomass,
+                                protein_per_batch)
+    dsp_capex = np.sum(dsp['capex'], axis=0)
+    dsp_kwh_per_kg = np.sum(dsp['kwh_per_kg'], axis=0)
+
+    # --- CAPEX ---
+    # "Six-tenths rule": cost scales with size^0.6 (not linearly)
+    reactor_size_ratio = reactor_volume / 100  # Ratio to base size (100 m³)
+    capex_per_reactor = CONSTANTS['reactor_base_cost'] * (reactor_size_ratio ** CONSTANTS['scaling_exponent'])
+    total_capex = capex_per_reactor * reactors_needed + dsp_capex
+
+    # --- OPEX ---
+    # 1. Substrate cost (usually 60-65% of OPEX)
+    substrate_cost_per_kg = substrate_kg_per_kg_protein * substrate_price
+
+    # 2. Energy cost
+    protein_per_reactor_kg_year = annual_capacity_per_reactor * 1000  # tons to kg
+    # Mixing: (power per m³) × (reactor volume) × (hours per year) ÷ (annual production)
+    mixing_kwh_per_kg = (
+        CONSTANTS['mixing_power_per_m3'] *
+        reactor_volume *
+        CONSTANTS['operating_hours_year']
+    ) / protein_per_reactor_kg_year
+    # Cooling: heat generated from fermentation
+    heat_generated_kcal_L = final_biomass * CONSTANTS['heat_per_kg_biomass'] / 1000
+    cooling_kwh_per_kg = heat_generated_kcal_L * 0.001  # Convert kcal to kWh (simplified)
+    total_energy_kwh_per_kg = mixing_kwh_per_kg + cooling_kwh_per_kg + dsp_kwh_per_kg
+    energy_cost_per_kg = total_energy_kwh_per_kg * energy_price
+
+    # 3. Labor cost
+    total_operators = reactors_needed * CONSTANTS['operators_per_reactor']
+    labor_cost_per_kg = (total_operators * CONSTANTS['operator_salary_year']) / (target_production * 1000)
+
+    # 4. Overhead: maintenance, QA/QC, administration, insurance
+    # Typically 30-40% of direct costs (substrate + energy + labor)
+    overhead_cost_per_kg = (substrate_cost_per_kg + energy_cost_per_kg + labor_cost_per_kg) * 0.4
+
+    # 5. Total OPEX per kg protein
+    total_opex_per_kg = substrate_cost_per_kg + energy_cost_per_kg + labor_cost_per_kg + overhead_cost_per_kg
+
+    # --- GHG emissions ---
+    substrate_emissions = substrate_kg_per_kg_protein * 0.25  # kg CO2 per kg glucose
+    energy_emissions = total_energy_kwh_per_kg * CONSTANTS['grid_emission_factor']
+    total_ghg = substrate_emissions + energy_emissions
+
+    # --- Water use ---
+    heat_load_factor = heat_generated_kcal_L / 20_000
+    cooling_water_L_per_kg = CONSTANTS['cooling_water_base'] * (1 + heat_load_factor * 0.5)
+    process_water_L_per_kg = 12  # Medium preparation, cleaning, etc.
+    total_water = cooling_water_L_per_kg + process_water_L_per_kg
+
+    # --- Land use ---
+    if reactors_needed == 1:
+        total_factory_footprint = CONSTANTS['base_footprint_m2']
+    else:
+        # Base footprint + additional space for each extra reactor
+        total_factory_footprint = (CONSTANTS['base_footprint_m2'] +
+                                   (reactors_needed - 1) * CONSTANTS['additional_reactor_footprint'])
+    land_use_m2_per_kg = total_factory_footprint / (target_production * 1000)
+    land_use_cm2_per_kg = land_use_m2_per_kg * 10000  # Convert to cm² for easier reading
+
+    # --- Payback (at assumed selling price) ---
+    if total_opex_per_kg < SELLING_PRICE:
+        annual_profit = (SELLING_PRICE - total_opex_per_kg) * target_production * 1000
+        payback_years = (total_capex * 1_000_000) / annual_profit
+    else:
+        payback_years = None  # Not viable
+
+    return {
+        # Inputs are echoed so a result dict is self-describing
+        'mu_max': mu_max,
+        'Yx_s': Yx_s,
+        'protein_content_pct': protein_content_pct,
+        'final_biomass': final_biomass,
+        'fermentation_time': fermentation_time,
+        'target_production': target_production,
+        'reactor_volume': reactor_volume,
+        'substrate_price': substrate_price,
+        'energy_price': energy_price,
+        # Derived values
+        'protein_concentration': protein_concentration,
+        'biomass_productivity': biomass_productivity,
+        'protein_productivity': protein_productivity,
+        'substrate_kg_per_kg_protein': substrate_kg_per_kg_protein,
+        'working_volume_m3': working_volume_m3,
+        'cycle_time': cycle_time,
+        'batches_per_year': batches_per_year,
+        'protein_per_batch': protein_per_batch,
+        'annual_capacity_per_reactor': annual_capacity_per_reactor,
+        'reactors_needed': reactors_needed,
+        'capex_per_reactor': capex_per_reactor,
+        'total_capex': total_capex,
+        'dsp': dsp,
+        'dsp_capex': dsp_capex,
+        'dsp_kwh_per_kg': dsp_kwh_per_kg,
+        'dsp_binding_unit': str(dsp['binding_unit']),
+        'dsp_binding_utilization': float(dsp['binding_utilization']),
+        'substrate_cost_per_kg': substrate_cost_per_kg,
+        'mixing_kwh_per_kg': mixing_kwh_per_kg,
+        'cooling_kwh_per_kg': cooling_kwh_per_kg,
+        'total_energy_kwh_per_kg': total_energy_kwh_per_kg,
+        'energy_cost_per_kg': energy_cost_per_kg,
+        'labor_cost_per_kg': labor_cost_per_kg,
+        'overhead_cost_per_kg': overhead_cost_per_kg,
+        'total_opex_per_kg': total_opex_per_kg,
+        'substrate_emissions': substrate_emissions,
+        'energy_emissions': energy_emissions,
+        'total_ghg': total_ghg,
+        'total_water': total_water,
+        'total_factory_footprint': total_factory_footprint,
+        'land_use_m2_per_kg': land_use_m2_per_kg,
+        'land_use_cm2_per_kg': land_use_cm2_per_kg,
+        'payback_years': payback_years,
+    }
+
+
+# ============================================================================
+# REPORT CONTENT - shared by the app and the bulk exporter
+# ============================================================================
+def kpi_cards(r):
+    """Return the top KPI row as a list of (label, value, delta) tuples."""
+    return [
+        ("🏭 Reactors Needed",
+         f"{int(r['reactors_needed'])}",
+         f"{r['reactor_volume']}m³ each"),
+        ("💰 Total OPEX",
+         f"${r['total_opex_per_kg']:.2f}/kg",
+         f"${r['substrate_cost_per_kg']:.2f} substrate"
+         if r['substrate_cost_per_kg'] > r['total_opex_per_kg'] * 0.4 else None),
+        ("🏗️ CAPEX",
+         f"${r['total_capex']:.1f}M",
+         f"${r['capex_per_reactor']:.1f}M per reactor"),
+        ("🌍 GHG Emissions",
+         f"{r['total_ghg']:.2f} kg CO₂eq/kg",
+         "30× less than beef" if r['total_ghg'] < 2.0 else None),
+    ]
+
+
+def cost_table(r):
+    """OPEX components per kg protein."""
+    return pd.DataFrame({
+        'Category': ['Substrate', 'Energy', 'Labor', 'Overhead'],
+        'Cost ($/kg)': [r['substrate_cost_per_kg'], r['energy_cost_per_kg'],
+                        r['labor_cost_per_kg'], r['overhead_cost_per_kg']]
+    })
+
+
+def ghg_table(r):
+    """GHG emissions per kg protein split by source."""
+    return pd.DataFrame({
+        'Source': ['Substrate Production', 'Energy Use'],
+        'Emissions (kg CO₂eq/kg)': [r['substrate_emissions'], r['energy_emissions']]
+    })
+
+
+def literature_benchmarks():
+    """The literature benchmarks as a new DataFrame."""
+    return pd.DataFrame({column: list(values) for column, values in BENCHMARKS.items()})
+
+
+def benchmark_table(r):
+    """Your SCP followed by the literature benchmarks."""
+    scp_row = pd.DataFrame({
+        'Protein Source': ['Your SCP'],
+        'GHG (kg CO₂eq/kg)': [r['total_ghg']],
+        'Water (L/kg)': [r['total_water']],
+        'Land (m²/kg)': [r['land_use_m2_per_kg']],
+        'Cost ($/kg)': [r['total_opex_per_kg']]
+    })
+    return pd.concat([scp_row, literature_benchmarks()], ignore_index=True)
+
+
+def dsp_table(r):
+    """One row per downstream processing stage."""
+    dsp = r['dsp']
+    return pd.DataFrame({
+        'Stage': dsp['stages'],
+        'Units': dsp['n_units'].astype(int),
+        'Utilization (%)': dsp['utilization'] * 100,
+        'Feed per Batch (m³)': dsp['feed_m3'],
+        'Mean Wait (h)': dsp['wait_h'],
+        'Buffer Tank (m³)': dsp['buffer_m3'],
+        'CAPEX ($M)': dsp['capex'],
+        'Energy (kWh/kg)': dsp['kwh_per_kg'],
+    })
+
+
+def competitive_position(r):
+    """Return the verdicts as (level, message); level is 'success', 'warning' or 'error'."""
+    verdicts = []
+
+    # Check if cost is competitive
+    opex = r['total_opex_per_kg']
+    if opex < 2.5:
+        verdicts.append(('success', f"✅ Your SCP cost (${opex:.2f}/kg) is competitive with plant proteins"))
+    elif opex < 4.0:
+        verdicts.append(('warning', f"⚠️ Your SCP cost (${opex:.2f}/kg) is between plant and animal proteins"))
+    else:
+        verdicts.append(('error', f"❌ Your SCP cost (${opex:.2f}/kg) is above animal proteins - optimization needed"))
+
+    # Check if GHG is competitive
+    ghg = r['total_ghg']
+    if ghg < 3.0:
+        verdicts.append(('success', f"✅ Your SCP GHG ({ghg:.2f} kg CO₂eq/kg) is competitive with plant proteins"))
+    else:
+        verdicts.append(('warning', f"⚠️ Your SCP GHG ({ghg:.2f} kg CO₂eq/kg) needs optimization"))
+
+    return verdicts
+
+
+# ============================================================================
+# FIGURES
+# ============================================================================
+def cost_figure(cost_data):
+    """OPEX donut chart."""
+    fig = px.pie(
+        cost_data,
+        values='Cost ($/kg)',
+        names='Category',
+        title='OPEX Breakdown',
+        hole=0.4  # Makes it a donut chart
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig
+
+
+def ghg_figure(ghg_data):
+    """GHG emissions by source bar chart."""
+    fig = px.bar(
+        ghg_data,
+        x='Source',
+        y='Emissions (kg CO₂eq/kg)',
+        title='GHG Emissions by Source',
+        text='Emissions (kg CO₂eq/kg)'
+    )
+    fig.update_traces(texttemplate='%{text:.2f}', textposition='outside')
+    return fig
+
+
+def benchmark_figures(benchmark_data):
+    """GHG and production cost comparison bar charts."""
+    fig_ghg_bench = px.bar(
+        benchmark_data,
+        x='Protein Source',
+        y='GHG (kg CO₂eq/kg)',
+        title='GHG Emissions Comparison',
+        text='GHG (kg CO₂eq/kg)',
+        color='Protein Source'
+    )
+    fig_ghg_bench.update_traces(texttemplate='%{text:.1f}', textposition='outside')
+
+    fig_cost_bench = px.bar(
+        benchmark_data,
+        x='Protein Source',
+        y='Cost ($/kg)',
+        title='Production Cost Comparison',
+        text='Cost ($/kg)',
+        color='Protein Source'
+    )
+    fig_cost_bench.update_traces(texttemplate='$%{text:.2f}', textposition='outside')
+    return fig_ghg_bench, fig_cost_bench
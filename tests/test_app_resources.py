@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+import pytest
+
+import app_resources
+from scp_model import BENCHMARKS, literature_benchmarks
+
+
+def test_track_session_drops_disconnected_sessions(monkeypatch):
+    registry = app_resources._session_registry()
+    registry['sessions'].clear()
+    connected = {'a', 'b', 'c'}
+    monkeypatch.setattr(app_resources, '_is_live', lambda session_id, last_seen, now: session_id in connected)
+
+    for session_id in ['a', 'b', 'c']:
+        monkeypatch.setattr(app_resources, 'get_script_run_ctx', lambda: SimpleNamespace(session_id=session_id))
+        app_resources.track_session()
+    assert set(registry['sessions']) == {'a', 'b', 'c'}
+
+    # 'a' and 'b' close their tabs; the next run from any session prunes them
+    connected = {'c', 'd'}
+    monkeypatch.setattr(app_resources, 'get_script_run_ctx', lambda: SimpleNamespace(session_id='d'))
+    app_resources.track_session()
+    assert set(registry['sessions']) == {'c', 'd'}
+    assert app_resources.memory_summary()['live_sessions'] == 2
+
+
+def test_benchmarks_cannot_be_changed():
+    with pytest.raises(TypeError):
+        BENCHMARKS['Cost ($/kg)'] = (0, 0, 0, 0, 0)
+    with pytest.raises(TypeError):
+        BENCHMARKS['Cost ($/kg)'][0] = 0
+
+    table = literature_benchmarks()
+    table.loc[0, 'Cost ($/kg)'] = 0
+    assert literature_benchmarks().loc[0, 'Cost ($/kg)'] == BENCHMARKS['Cost ($/kg)'][0] == 6.0
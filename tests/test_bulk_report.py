@@ -0,0 +1,97 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+import bulk_report
+from bulk_report import SUMMARY_TABLE_COLUMNS, _scenario_inputs, export_reports, render_report
+from scp_model import (
+    DEFAULT_INPUTS, benchmark_figures, benchmark_table, calculate_scenario, cost_figure, cost_table,
+    ghg_figure, ghg_table,
+)
+
+
+def read_rows(csv_text):
+    return pd.read_csv(io.StringIO(csv_text)).to_dict('records')
+
+
+def test_inputs_are_typed_like_defaults():
+    # reactor_volume has a blank cell (read as float), target_production has a
+    # text cell (read as str), final_biomass holds whole numbers (read as int)
+    rows = read_rows(
+        "reactor_volume,target_production,final_biomass\n"
+        "500,2000,80\n"
+        ",abc,90\n"
+    )
+    first = _scenario_inputs(rows[0])
+    for key, default in DEFAULT_INPUTS.items():
+        assert type(first[key]) is type(default), key
+    assert first['reactor_volume'] == 500
+    assert first['target_production'] == 2000
+    assert first['final_biomass'] == 80.0
+
+    second = _scenario_inputs(rows[1])
+    assert second['reactor_volume'] == DEFAULT_INPUTS['reactor_volume']
+    assert type(second['reactor_volume']) is int
+    assert second['target_production'] == 'abc'  # Reported as an error later
+    assert type(second['final_biomass']) is float
+
+
+def test_duplicate_and_colliding_names_get_distinct_files(tmp_path):
+    scenarios = pd.DataFrame({'scenario': ['base', 'base', 'base_2']})
+    summary = export_reports(scenarios, tmp_path, workers=1)
+    assert list(summary['report']) == ['base.html', 'base_2.html', 'base_2_2.html']
+    for name in summary['report']:
+        assert (tmp_path / name).is_file()
+
+
+def test_bad_row_is_recorded_and_others_export(tmp_path):
+    scenarios = pd.DataFrame({
+        'scenario': ['good', 'text', 'zero', 'also good'],
+        'reactor_volume': ['100', 'abc', '100', '50'],
+        'fermentation_time': [42, 42, 0, 40],
+    })
+    summary = export_reports(scenarios, tmp_path, workers=1)
+    assert list(summary.columns) == SUMMARY_TABLE_COLUMNS
+    assert summary['error'].isna().tolist() == [True, False, False, True]
+    assert summary['report'].isna().tolist() == [False, True, True, False]
+    assert (tmp_path / 'good.html').is_file()
+    assert (tmp_path / 'also_good.html').is_file()
+    assert (tmp_path / 'summary.xlsx').is_file()
+
+
+def test_empty_csv_writes_empty_summary(tmp_path):
+    scenarios = pd.read_csv(io.StringIO("scenario,reactor_volume\n"))
+    summary = export_reports(scenarios, tmp_path, workers=1)
+    assert summary.empty
+    assert list(summary.columns) == SUMMARY_TABLE_COLUMNS
+    assert (tmp_path / 'summary.xlsx').is_file()
+
+
+def test_reused_figures_match_freshly_built_ones():
+    bulk_report._init_worker()  # Templates built from the default scenario
+    r = calculate_scenario(**{**DEFAULT_INPUTS, 'final_biomass': 90.0, 'reactor_volume': 500,
+                              'substrate_price': 1.2})
+    page = render_report(r, 'non-default')
+    assert 'non-default' in page
+
+    fresh = {
+        'cost': cost_figure(cost_table(r)),
+        'ghg': ghg_figure(ghg_table(r)),
+    }
+    fresh['ghg_bench'], fresh['cost_bench'] = benchmark_figures(benchmark_table(r))
+    for key, fig in fresh.items():
+        reused = bulk_report._figures[key]
+        assert len(reused.data) == len(fig.data), key
+        for reused_trace, fresh_trace in zip(reused.data, fig.data):
+            for attr in ('labels', 'values', 'x', 'y', 'text'):
+                expected = getattr(fresh_trace, attr, None)
+                if expected is None:
+                    continue
+                actual = getattr(reused_trace, attr)
+                if np.asarray(expected).dtype.kind in 'fi':
+                    np.testing.assert_allclose(np.asarray(actual, dtype=float),
+                                               np.asarray(expected, dtype=float), err_msg=f"{key}.{attr}")
+                else:
+                    assert list(actual) == list(expected), f"{key}.{attr}"
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from scp_model import DEFAULT_INPUTS, DSP_CONSTANTS, DSP_UNITS, calculate_scenario, downstream_processing
+
+TARGET = DSP_CONSTANTS['target_utilization']
+
+
+def random_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return dict(
+        reactors_needed=rng.integers(1, 200, n),
+        cycle_time=rng.uniform(59, 79, n),
+        working_volume_m3=rng.choice([8, 40, 80, 160, 400], n),
+        final_biomass=rng.uniform(50, 95, n),
+        protein_per_batch=rng.uniform(300, 30000, n),
+    )
+
+
+def test_utilization_never_exceeds_target():
+    dsp = downstream_processing(**random_inputs(10_000))
+    assert dsp['utilization'].shape == (len(DSP_UNITS), 10_000)
+    assert np.all(dsp['utilization'] <= TARGET + 1e-12)
+    assert np.all(dsp['n_units'] >= 1)
+
+
+def test_scalar_and_array_results_match():
+    inputs = random_inputs(20, seed=1)
+    vectorized = downstream_processing(**inputs)
+    for i in range(20):
+        scalar = downstream_processing(**{key: value[i] for key, value in inputs.items()})
+        for key in ('feed_m3', 'n_units', 'utilization', 'wait_h', 'buffer_m3', 'capex', 'kwh_per_kg'):
+            np.testing.assert_allclose(vectorized[key][:, i], scalar[key])
+        assert vectorized['binding_unit'][i] == scalar['binding_unit']
+        assert vectorized['max_arrival_rate'][i] == pytest.approx(scalar['max_arrival_rate'])
+
+
+def test_spray_drying_binds_at_default_inputs():
+    r = calculate_scenario(**DEFAULT_INPUTS)
+    assert r['dsp_binding_unit'] == 'Spray Drying'
+    assert 0 < r['dsp_binding_utilization'] <= TARGET
+
+
+def test_wait_is_finite_as_utilization_approaches_target():
+    # One centrifuge fed 40 m³ batches takes 1 h per batch, so utilization
+    # equals the arrival rate; approach the target from below
+    arrival_rate = TARGET - np.logspace(-1, -9, 50)
+    dsp = downstream_processing(
+        reactors_needed=1, cycle_time=1 / arrival_rate, working_volume_m3=40,
+        final_biomass=70, protein_per_batch=2000,
+    )
+    centrifuge = list(DSP_UNITS).index('Centrifugation')
+    np.testing.assert_allclose(dsp['utilization'][centrifuge], arrival_rate)
+    assert np.all(dsp['n_units'][centrifuge] == 1)
+    assert np.all(np.isfinite(dsp['wait_h']))
+    assert np.all(np.isfinite(dsp['buffer_m3']))
+    assert np.all(np.diff(dsp['wait_h'][centrifuge]) > 0)
+
+
+def test_scalar_inputs_broadcast_against_array_inputs():
+    final_biomass = np.array([50.0, 70.0, 95.0])
+    mixed = downstream_processing(3, 66, 80, final_biomass, 3640)
+    assert mixed['utilization'].shape == (len(DSP_UNITS), 3)
+    for i, biomass in enumerate(final_biomass):
+        scalar = downstream_processing(3, 66, 80, biomass, 3640)
+        np.testing.assert_allclose(mixed['utilization'][:, i], scalar['utilization'])
+        np.testing.assert_allclose(mixed['buffer_m3'][:, i], scalar['buffer_m3'])
+        np.testing.assert_allclose(mixed['capex'][:, i], scalar['capex'])